@@ -0,0 +1,210 @@
+import os
+import sys
+import threading
+import time
+from statistics import median
+import scrap
+
+
+PERFIS = ['completo', 'leve']
+PAGINAS_ESPERADAS = 5
+INTERVALO_AMOSTRAGEM = 0.2
+
+
+def _processos_descendentes(pid: int) -> list[int]:
+    """
+    Retorna o PID informado e de todos os seus descendentes (Linux, via `/proc`).
+
+    Parâmetros:
+    -----------
+    pid : int
+        PID do processo raiz (neste caso, o chromedriver).
+
+    Retorno:
+    --------
+    list[int]
+        Lista contendo o PID raiz e os PIDs de todos os processos descendentes.
+    """
+    filhos = {}
+    for entrada in os.listdir('/proc'):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entrada}/stat') as f:
+                # O nome do processo pode conter espaços, por isso o split após ')'
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        filhos.setdefault(ppid, []).append(int(entrada))
+
+    pids = [pid]
+    for atual in pids:
+        pids.extend(filhos.get(atual, []))
+    return pids
+
+
+def _rss_mb(pid: int) -> float:
+    """
+    Soma a memória residente atual (VmRSS) da árvore de processos do navegador.
+
+    Parâmetros:
+    -----------
+    pid : int
+        PID do processo raiz (neste caso, o chromedriver).
+
+    Retorno:
+    --------
+    float
+        Soma do RSS de todos os processos da árvore, em MB.
+    """
+    total_kb = 0
+    for atual in _processos_descendentes(pid):
+        try:
+            with open(f'/proc/{atual}/status') as f:
+                for linha in f:
+                    if linha.startswith('VmRSS:'):
+                        total_kb += int(linha.split()[1])
+                        break
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+class _AmostradorRSS(threading.Thread):
+    """Amostra periodicamente o RSS da árvore do navegador e guarda o pico observado."""
+
+    def __init__(self, pid: int) -> None:
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.pico_mb = 0.0
+        self._parar = threading.Event()
+
+    def run(self) -> None:
+        while not self._parar.is_set():
+            self.pico_mb = max(self.pico_mb, _rss_mb(self.pid))
+            self._parar.wait(INTERVALO_AMOSTRAGEM)
+
+    def parar(self) -> float:
+        self._parar.set()
+        self.join()
+        return self.pico_mb
+
+
+def _contar_paginas(nome: str, contador: dict) -> None:
+    """Envolve `scrap.<nome>` para contar as páginas convertidas em DataFrame."""
+    original = getattr(scrap, nome)
+
+    def contando(tabela):
+        contador[nome] = contador.get(nome, 0) + 1
+        return original(tabela)
+
+    setattr(scrap, nome, contando)
+
+
+def _medir(perfil: str, scraper) -> tuple[float, float, int, set]:
+    """
+    Executa um scraping completo com o perfil informado, medindo tempo e pico de RSS.
+
+    Parâmetros:
+    -----------
+    perfil : str
+        Perfil do navegador repassado para `scrap._criar_driver`.
+    scraper : callable
+        `scrap._scraping_por_codigo` ou `scrap._scraping_por_setor`. O driver é
+        injetado na função, que o encerra ao final.
+
+    Retorno:
+    --------
+    tuple[float, float, int, set]
+        Duração em segundos, pico de RSS em MB, quantidade de páginas processadas
+        e o conjunto de códigos retornados.
+    """
+    contador = {}
+    originais = {nome: getattr(scrap, nome) for nome in ('_to_dataframe_codigo', '_to_dataframe_setor')}
+    for nome in originais:
+        _contar_paginas(nome, contador)
+
+    try:
+        driver = scrap._criar_driver(perfil)
+        amostrador = _AmostradorRSS(driver.service.process.pid)
+        amostrador.start()
+        inicio = time.perf_counter()
+        try:
+            df = scraper(driver)
+        finally:
+            duracao = time.perf_counter() - inicio
+            pico = amostrador.parar()
+    finally:
+        for nome, original in originais.items():
+            setattr(scrap, nome, original)
+
+    return duracao, pico, sum(contador.values()), set(df['Código'])
+
+
+def main(repeticoes: int) -> None:
+    """
+    Compara os perfis de navegador em um scraping completo por código e por setor.
+
+    Para cada perfil e scraper são medidos a duração total (carregamento,
+    paginação e, no scraping por setor, o `<select>` de segmento) e o pico de
+    RSS da árvore de processos do navegador, amostrado durante toda a execução.
+    Também é verificado se todas as páginas foram processadas e se o perfil
+    retorna os mesmos códigos que o perfil 'completo'.
+
+    Parâmetros:
+    -----------
+    repeticoes : int
+        Quantidade de execuções para cada perfil e scraper. O resultado exibido
+        é a mediana das medições.
+
+    Tratamento de Erros:
+    --------------------
+    - Se algum perfil não processar as 5 páginas ou retornar códigos diferentes
+      do perfil 'completo', o programa é finalizado com `exit(1)`.
+
+    Exemplo de uso:
+    ---------------
+    Comparar os perfis com 3 execuções cada (somente Linux):
+
+        python benchmark_navegador.py 3
+    """
+    scrapers = {
+        'código': scrap._scraping_por_codigo,
+        'setor': scrap._scraping_por_setor,
+    }
+    resultados = []
+    falhas = []
+    referencia = {}
+
+    for nome, scraper in scrapers.items():
+        for perfil in PERFIS:
+            medicoes = [_medir(perfil, scraper) for _ in range(repeticoes)]
+            resultados.append((
+                nome,
+                perfil,
+                median(m[0] for m in medicoes),
+                median(m[1] for m in medicoes),
+                min(m[2] for m in medicoes),
+            ))
+
+            for _, _, paginas, codigos in medicoes:
+                if paginas != PAGINAS_ESPERADAS:
+                    falhas.append(f'{nome}/{perfil}: {paginas} de {PAGINAS_ESPERADAS} páginas processadas')
+                if perfil == 'completo':
+                    referencia.setdefault(nome, codigos)
+                elif codigos != referencia.get(nome):
+                    falhas.append(f'{nome}/{perfil}: códigos diferentes do perfil completo')
+
+    print(f'\n{"scraping":<10} {"perfil":<10} {"duração (s)":>12} {"pico RSS (MB)":>15} {"páginas":>8}')
+    for nome, perfil, duracao, rss, paginas in resultados:
+        print(f'{nome:<10} {perfil:<10} {duracao:>12.2f} {rss:>15.1f} {paginas:>8}')
+
+    if falhas:
+        print('\nValidação falhou:')
+        for falha in falhas:
+            print(f'- {falha}')
+        exit(1)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 3)
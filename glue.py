@@ -7,6 +7,7 @@ from awsglue.job import Job
 from awsgluedq.transforms import EvaluateDataQuality
 from awsglue.dynamicframe import DynamicFrame
 from pyspark.sql import functions as SqlFuncs
+from pyspark.sql import Window
 
 def sparkAggregate(glueContext, parentFrame, groups, aggs, transformation_ctx) -> DynamicFrame:
     aggsFuncs = []
@@ -15,7 +16,120 @@ def sparkAggregate(glueContext, parentFrame, groups, aggs, transformation_ctx) -
     result = parentFrame.toDF().groupBy(*groups).agg(*aggsFuncs) if len(groups) > 0 else parentFrame.toDF().agg(*aggsFuncs)
     return DynamicFrame.fromDF(result, glueContext, transformation_ctx)
 
-args = getResolvedOptions(sys.argv, ['JOB_NAME'])
+def rollupAggs():
+    # Métricas comuns aos rollups: somas, contagens e empresas em alta/queda
+    return [
+        SqlFuncs.sum("quantidade_total").alias("quantidade_total"),
+        SqlFuncs.sum("diff_quantidade").alias("diff_quantidade"),
+        SqlFuncs.count("empresa").alias("empresas"),
+        SqlFuncs.sum(SqlFuncs.when(SqlFuncs.col("diff_quantidade") > 0, 1).otherwise(0)).alias("empresas_em_alta"),
+        SqlFuncs.sum(SqlFuncs.when(SqlFuncs.col("diff_quantidade") < 0, 1).otherwise(0)).alias("empresas_em_queda"),
+    ]
+
+def topMovers(df, groups, n):
+    # Para cada grupo, lista as n empresas com maior alta e com maior queda de diff_quantidade,
+    # como array<struct<posicao, empresa, diff_quantidade>> ordenado pela posição.
+    # Empresas sem variação não entram; grupos sem movimentos ficam com o array nulo
+    result = df.select(*groups).distinct()
+    for alias, movers, order in [
+        ("maiores_altas", SqlFuncs.col("diff_quantidade") > 0, SqlFuncs.col("diff_quantidade").desc()),
+        ("maiores_quedas", SqlFuncs.col("diff_quantidade") < 0, SqlFuncs.col("diff_quantidade").asc()),
+    ]:
+        window = Window.partitionBy(*groups).orderBy(order, SqlFuncs.col("empresa"))
+        ranked = df.filter(movers) \
+                   .withColumn("posicao", SqlFuncs.row_number().over(window)) \
+                   .filter(SqlFuncs.col("posicao") <= n) \
+                   .groupBy(*groups) \
+                   .agg(SqlFuncs.sort_array(SqlFuncs.collect_list(
+                       SqlFuncs.struct("posicao", "empresa", "diff_quantidade"))).alias(alias))
+        result = result.join(ranked, on=groups, how="left")
+    return result
+
+def diffDiario(df_empresa_dia):
+    # Calcula o diff_quantidade de cada empresa em relação ao pregão anterior (a data
+    # imediatamente anterior presente nos dados), com a mesma regra do job principal:
+    # empresas ausentes no pregão anterior recebem 0
+    datas = df_empresa_dia.select("date_parsed").distinct() \
+        .withColumn("prev_date", SqlFuncs.lag("date_parsed").over(Window.orderBy("date_parsed")))
+    anterior = df_empresa_dia.select(
+        "empresa", "Setor",
+        SqlFuncs.col("date_parsed").alias("prev_date"),
+        SqlFuncs.col("quantidade_total").alias("quantidade_total_previous")
+    )
+    return df_empresa_dia.join(datas, on="date_parsed") \
+        .join(anterior, on=["empresa", "Setor", "prev_date"], how="left") \
+        .withColumn(
+            "diff_quantidade",
+            SqlFuncs.when(SqlFuncs.col("quantidade_total_previous").isNull(), SqlFuncs.lit(0))
+            .otherwise(SqlFuncs.col("quantidade_total") - SqlFuncs.col("quantidade_total_previous"))
+        )
+
+def diffMensal(df_empresa_dia):
+    # Para cada mês, compara o último pregão do mês com o último pregão anterior ao mês
+    # (ou, se não existir, com o primeiro pregão do mês); empresas sem valor de referência
+    # recebem 0. Retorna uma linha por empresa e mês, com a quantidade de pregões do mês
+    df = df_empresa_dia.withColumn("Mes", SqlFuncs.date_format("date_parsed", "yyyy-MM"))
+    meses = df.groupBy("Mes").agg(
+        SqlFuncs.max("date_parsed").alias("ultimo_pregao"),
+        SqlFuncs.min("date_parsed").alias("primeiro_pregao"),
+        SqlFuncs.countDistinct("date_parsed").alias("pregoes")
+    ).withColumn(
+        "base_date",
+        SqlFuncs.coalesce(
+            SqlFuncs.lag("ultimo_pregao").over(Window.orderBy("Mes")),
+            SqlFuncs.col("primeiro_pregao")
+        )
+    )
+    base = df.select(
+        "empresa", "Setor",
+        SqlFuncs.col("date_parsed").alias("base_date"),
+        SqlFuncs.col("quantidade_total").alias("quantidade_base")
+    )
+    return df.join(meses, on="Mes") \
+        .filter(SqlFuncs.col("date_parsed") == SqlFuncs.col("ultimo_pregao")) \
+        .join(base, on=["empresa", "Setor", "base_date"], how="left") \
+        .withColumn(
+            "diff_quantidade",
+            SqlFuncs.when(SqlFuncs.col("quantidade_base").isNull(), SqlFuncs.lit(0))
+            .otherwise(SqlFuncs.col("quantidade_total") - SqlFuncs.col("quantidade_base"))
+        )
+
+def rollupSetorDia(df):
+    return df.groupBy("Data", "Setor").agg(*rollupAggs()) \
+        .join(topMovers(df, ["Data", "Setor"], TOP_MOVERS_N), on=["Data", "Setor"], how="left")
+
+def rollupDia(df):
+    return df.groupBy("Data") \
+        .agg(*rollupAggs(), SqlFuncs.countDistinct("Setor").alias("setores")) \
+        .join(topMovers(df, ["Data"], TOP_MOVERS_N), on=["Data"], how="left")
+
+def rollupMes(df):
+    return df.groupBy("Mes", "pregoes") \
+        .agg(*rollupAggs(), SqlFuncs.countDistinct("Setor").alias("setores")) \
+        .join(topMovers(df, ["Mes"], TOP_MOVERS_N), on=["Mes"], how="left")
+
+def writeRollup(glueContext, df, path, partitionKeys, partitionPath, tableName, transformation_ctx) -> None:
+    # Remove a partição gravada (ou a tabela inteira, se partitionPath for None) antes de
+    # gravar, para que reprocessamentos não dupliquem linhas
+    purgePath = f"{path}/{partitionPath}/" if partitionPath else f"{path}/"
+    glueContext.purge_s3_path(purgePath, {"retentionPeriod": 0})
+    sink = glueContext.getSink(
+        path=path,
+        connection_type="s3",
+        updateBehavior="UPDATE_IN_DATABASE",
+        partitionKeys=partitionKeys,
+        enableUpdateCatalog=True,
+        transformation_ctx=transformation_ctx
+    )
+    sink.setCatalogInfo(catalogDatabase="default", catalogTableName=tableName)
+    sink.setFormat("glueparquet", compression="snappy")
+    sink.writeFrame(DynamicFrame.fromDF(df, glueContext, transformation_ctx))
+
+# Modo de backfill (--BACKFILL_ROLLUPS true): recalcula as tabelas de rollup para todo o
+# histórico do bucket raw, sem gravar a tabela principal
+BACKFILL_ROLLUPS = '--BACKFILL_ROLLUPS' in sys.argv
+args = getResolvedOptions(sys.argv, ['JOB_NAME'] + (['BACKFILL_ROLLUPS'] if BACKFILL_ROLLUPS else []))
+BACKFILL_ROLLUPS = BACKFILL_ROLLUPS and args['BACKFILL_ROLLUPS'].lower() == 'true'
 sc = SparkContext()
 glueContext = GlueContext(sc)
 spark = glueContext.spark_session
@@ -23,6 +137,12 @@ job = Job(glueContext)
 job.init(args['JOB_NAME'], args)
 
 
+REFINED_PATH = "s3://valteci-b3-refined"
+ROLLUPS_PATH = f"{REFINED_PATH}/rollups"
+
+# Quantidade de empresas listadas em maiores_altas/maiores_quedas nas tabelas de rollup
+TOP_MOVERS_N = 5
+
 # Default ruleset used by all target nodes with data quality enabled
 DEFAULT_DATA_QUALITY_RULESET = """
     Rules = [
@@ -148,21 +268,90 @@ RenameField_node1741867697267 = RenameField.apply(
 )
 
 # Script gerado para o node Amazon S3
-EvaluateDataQuality().process_rows(
-    frame=RenameField_node1741867697267, 
-    ruleset=DEFAULT_DATA_QUALITY_RULESET, 
-    publishing_options={"dataQualityEvaluationContext": "EvaluateDataQuality_node1741820215329", "enableDataQualityResultsPublishing": True}, 
-    additional_options={"dataQualityResultsPublishing.strategy": "BEST_EFFORT", "observations.scope": "ALL"}
+# (não executado no modo de backfill, para não duplicar o pregão atual na tabela principal)
+if not BACKFILL_ROLLUPS:
+    EvaluateDataQuality().process_rows(
+        frame=RenameField_node1741867697267, 
+        ruleset=DEFAULT_DATA_QUALITY_RULESET, 
+        publishing_options={"dataQualityEvaluationContext": "EvaluateDataQuality_node1741820215329", "enableDataQualityResultsPublishing": True}, 
+        additional_options={"dataQualityResultsPublishing.strategy": "BEST_EFFORT", "observations.scope": "ALL"}
+    )
+    AmazonS3_node1741820619439 = glueContext.getSink(
+        path=REFINED_PATH, 
+        connection_type="s3", 
+        updateBehavior="UPDATE_IN_DATABASE", 
+        partitionKeys=["Data", "empresa"], 
+        enableUpdateCatalog=True, 
+        transformation_ctx="AmazonS3_node1741820619439"
+    )
+    AmazonS3_node1741820619439.setCatalogInfo(catalogDatabase="default", catalogTableName="bovespa_ETL_glue")
+    AmazonS3_node1741820619439.setFormat("glueparquet", compression="snappy")
+    AmazonS3_node1741820619439.writeFrame(RenameField_node1741867697267)
+
+
+# ======================== TABELAS DE ROLLUP ========================
+
+if BACKFILL_ROLLUPS:
+    # --- Backfill: todas as datas e meses do histórico ---
+    df_empresa_dia = df_raw.groupBy("empresa", "Setor", "Data", "date_parsed") \
+        .agg(SqlFuncs.sum("quantidade").alias("quantidade_total")) \
+        .cache()
+    df_rollup_base = diffDiario(df_empresa_dia)
+    df_mes_empresa = diffMensal(df_empresa_dia)
+    particao_dia = None
+    particao_mes = None
+else:
+    # --- Execução diária: pregão atual e mês do pregão atual ---
+    df_rollup_base = df_final.select("empresa", "Setor", "Data", "quantidade_total", "diff_quantidade")
+
+    # Para o rollup mensal basta o histórico a partir do último pregão anterior ao mês,
+    # que é a referência do diff mensal; o recorte é lido do bucket uma única vez
+    mes_atual = max_date_val.strftime("%Y-%m")
+    inicio_mes = max_date_val.replace(day=1)
+    base_date_val = df_raw.filter(SqlFuncs.col("date_parsed") < SqlFuncs.lit(inicio_mes)) \
+                          .agg(SqlFuncs.max("date_parsed").alias("base_date")).collect()[0]["base_date"]
+    df_empresa_dia = df_raw.filter(
+        (SqlFuncs.col("date_parsed") >= SqlFuncs.lit(base_date_val or inicio_mes)) &
+        (SqlFuncs.col("date_parsed") <= SqlFuncs.lit(max_date_val))
+    ).groupBy("empresa", "Setor", "Data", "date_parsed") \
+     .agg(SqlFuncs.sum("quantidade").alias("quantidade_total")) \
+     .cache()
+    df_mes_empresa = diffMensal(df_empresa_dia).filter(SqlFuncs.col("Mes") == mes_atual)
+    particao_dia = f"Data={max_date_val.strftime('%d-%m-%Y')}"
+    particao_mes = f"Mes={mes_atual}"
+
+df_rollup_base = df_rollup_base.cache()
+
+# --- Rollup por setor e dia ---
+writeRollup(
+    glueContext, rollupSetorDia(df_rollup_base),
+    path=f"{ROLLUPS_PATH}/setor_dia",
+    partitionKeys=["Data"],
+    partitionPath=particao_dia,
+    tableName="bovespa_ETL_glue_setor_dia",
+    transformation_ctx="Rollup_setor_dia"
+)
+
+# --- Rollup diário do índice ---
+writeRollup(
+    glueContext, rollupDia(df_rollup_base),
+    path=f"{ROLLUPS_PATH}/dia",
+    partitionKeys=["Data"],
+    partitionPath=particao_dia,
+    tableName="bovespa_ETL_glue_dia",
+    transformation_ctx="Rollup_dia"
 )
-AmazonS3_node1741820619439 = glueContext.getSink(
-    path="s3://valteci-b3-refined", 
-    connection_type="s3", 
-    updateBehavior="UPDATE_IN_DATABASE", 
-    partitionKeys=["Data", "empresa"], 
-    enableUpdateCatalog=True, 
-    transformation_ctx="AmazonS3_node1741820619439"
+
+# --- Rollup mensal ---
+writeRollup(
+    glueContext, rollupMes(df_mes_empresa),
+    path=f"{ROLLUPS_PATH}/mes",
+    partitionKeys=["Mes"],
+    partitionPath=particao_mes,
+    tableName="bovespa_ETL_glue_mes",
+    transformation_ctx="Rollup_mes"
 )
-AmazonS3_node1741820619439.setCatalogInfo(catalogDatabase="default", catalogTableName="bovespa_ETL_glue")
-AmazonS3_node1741820619439.setFormat("glueparquet", compression="snappy")
-AmazonS3_node1741820619439.writeFrame(RenameField_node1741867697267)
+
+# ===================================================================
+
 job.commit()
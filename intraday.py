@@ -0,0 +1,172 @@
+import os
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import pandas as pd
+import s3
+import scrap
+
+
+INTRADAY_BUCKET_NAME = os.getenv('INTRADAY_BUCKET_NAME', 'valteci-b3-intraday')
+LOTE_MAX_LINHAS = int(os.getenv('INTRADAY_LOTE_MAX_LINHAS', '10000'))
+LOTE_MAX_SEGUNDOS = int(os.getenv('INTRADAY_LOTE_MAX_SEGUNDOS', '900'))
+LIMITE_MEMORIA_MB = int(os.getenv('INTRADAY_LIMITE_MEMORIA_MB', '64'))
+
+# Horário de referência do pregão, das capturas e das partições, independente do fuso do servidor
+FUSO_HORARIO = ZoneInfo('America/Sao_Paulo')
+
+
+class BufferIntraday:
+    """
+    Buffer em memória para snapshots intraday, gravados em micro-lotes Parquet.
+
+    Cada captura é acrescentada ao buffer com a coluna 'Captura' (timestamp da
+    coleta, no horário de Brasília). O buffer é descarregado para o S3 quando atinge a quantidade máxima
+    de linhas, quando o lote mais antigo ultrapassa o tempo máximo ou quando a
+    próxima captura excederia o limite de memória. Os arquivos são particionados
+    por data e hora da captura (`dia=dd-mm-YYYY/hora=HH/`).
+
+    Parâmetros:
+    -----------
+    bucket_name : str, opcional
+        Bucket de destino. Deve ser diferente do bucket diário, que é lido por
+        completo pelo job Glue.
+    max_linhas : int, opcional
+        Quantidade de linhas que dispara o descarregamento do buffer.
+    max_segundos : int, opcional
+        Idade máxima (em segundos) da captura mais antiga antes do descarregamento.
+    limite_memoria_mb : int, opcional
+        Limite de memória ocupada pelo buffer, em MB.
+
+    Exemplo de uso:
+    ---------------
+    buffer = BufferIntraday()
+    try:
+        buffer.adicionar(scrap.coletar())
+        buffer.flush_se_expirado()
+    finally:
+        buffer.flush()
+    """
+
+    def __init__(
+            self,
+            bucket_name: str = INTRADAY_BUCKET_NAME,
+            max_linhas: int = LOTE_MAX_LINHAS,
+            max_segundos: int = LOTE_MAX_SEGUNDOS,
+            limite_memoria_mb: int = LIMITE_MEMORIA_MB
+    ) -> None:
+        self.bucket_name = bucket_name
+        self.max_linhas = max_linhas
+        self.max_segundos = max_segundos
+        self.limite_bytes = limite_memoria_mb * 1024 * 1024
+        self._capturas: list[pd.DataFrame] = []
+        self._linhas = 0
+        self._bytes = 0
+        self._inicio_lote: float | None = None
+
+    def adicionar(self, df: pd.DataFrame, captura: datetime = None) -> None:
+        """
+        Acrescenta uma captura ao buffer, descarregando-o se necessário.
+
+        Parâmetros:
+        -----------
+        df : pd.DataFrame
+            DataFrame retornado por `scrap.coletar`.
+        captura : datetime, opcional
+            Momento em que a coleta foi iniciada. É convertido para `FUSO_HORARIO`
+            (datas sem fuso são interpretadas no fuso do servidor). Se não for
+            informado, utiliza o horário atual.
+
+        Comportamento:
+        --------------
+        - Se a nova captura fizer o buffer ultrapassar o limite de memória, o
+          conteúdo atual é descarregado antes de acrescentá-la.
+        - Se o descarregamento falhar e ainda não houver espaço, as capturas mais
+          antigas são descartadas (com aviso no console) para manter o limite.
+        - Após acrescentar, o buffer é descarregado se atingir `max_linhas`.
+        """
+        df = df.copy()
+        df['Captura'] = pd.Timestamp((captura or datetime.now()).astimezone(FUSO_HORARIO))
+        tamanho = int(df.memory_usage(deep=True).sum())
+
+        if self._capturas and self._bytes + tamanho > self.limite_bytes:
+            self.flush()
+
+        while self._capturas and self._bytes + tamanho > self.limite_bytes:
+            descartada = self._capturas.pop(0)
+            self._linhas -= len(descartada)
+            self._bytes -= int(descartada.memory_usage(deep=True).sum())
+            print(f'Limite de memória do buffer intraday atingido: {len(descartada)} linhas descartadas.')
+
+        self._acrescentar(df, tamanho)
+
+        if self._linhas >= self.max_linhas or self._bytes >= self.limite_bytes:
+            self.flush()
+
+    def flush_se_expirado(self) -> None:
+        """Descarrega o buffer se a captura mais antiga ultrapassou `max_segundos`."""
+        if self._inicio_lote is not None and time.monotonic() - self._inicio_lote >= self.max_segundos:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Grava o conteúdo do buffer no S3, um arquivo Parquet por partição de data e hora.
+
+        Os arquivos são nomeados com o primeiro e o último horário de captura da
+        partição (ex.: `dia=17-03-2025/hora=10/17-03-2025_10-00-05_10-14-07.parquet`).
+        Caso o buffer esteja vazio, nenhuma ação é realizada.
+
+        Retorno:
+        --------
+        bool
+            True se todas as partições foram enviadas (ou se o buffer estava vazio),
+            False caso alguma tenha falhado.
+
+        Tratamento de Erros:
+        --------------------
+        - Apenas as partições enviadas com sucesso são removidas do buffer. As
+          partições que falharam permanecem no buffer para nova tentativa no
+          próximo descarregamento, quando o arquivo é gerado novamente.
+        - O arquivo local é sempre removido, com ou sem sucesso no envio.
+        """
+        if not self._capturas:
+            return True
+
+        df = pd.concat(self._capturas, ignore_index=True)
+        inicio_lote = self._inicio_lote
+        self._capturas = []
+        self._linhas = 0
+        self._bytes = 0
+        self._inicio_lote = None
+
+        particoes = df.groupby([
+            df['Captura'].dt.strftime('%d-%m-%Y'),
+            df['Captura'].dt.strftime('%H')
+        ])
+        for (dia, hora), df_particao in particoes:
+            inicio = df_particao['Captura'].min().strftime('%H-%M-%S')
+            fim = df_particao['Captura'].max().strftime('%H-%M-%S')
+            filename = f'{dia}_{inicio}_{fim}.parquet'
+
+            enviado = (
+                scrap._gerar_parquet(df_particao, filename)
+                and s3.upload(filename, self.bucket_name, prefix=f'dia={dia}/hora={hora}')
+            )
+            scrap._remove_file(filename)
+            if not enviado:
+                print(f'Falha ao gravar a partição dia={dia}/hora={hora}; {len(df_particao)} linhas mantidas no buffer.')
+                for _, df_captura in df_particao.groupby('Captura'):
+                    self._acrescentar(df_captura, int(df_captura.memory_usage(deep=True).sum()))
+
+        if self._capturas:
+            self._inicio_lote = inicio_lote
+            return False
+        return True
+
+    def _acrescentar(self, df: pd.DataFrame, tamanho: int) -> None:
+        """Acrescenta um DataFrame ao buffer e atualiza os contadores."""
+        if self._inicio_lote is None:
+            self._inicio_lote = time.monotonic()
+        self._capturas.append(df)
+        self._linhas += len(df)
+        self._bytes += tamanho
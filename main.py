@@ -1,5 +1,19 @@
 import asyncio
+import os
+import signal
+import sys
+import time
+from datetime import datetime
 import scrap
+import intraday
+
+
+# Modo de execução: 'diario' (um snapshot por dia) ou 'intraday' (snapshots durante o pregão)
+MODO_EXECUCAO = os.getenv('MODO_EXECUCAO', 'diario')
+INTERVALO_INTRADAY_MINUTOS = int(os.getenv('INTERVALO_INTRADAY_MINUTOS', '1'))
+INICIO_PREGAO = datetime.strptime(os.getenv('INICIO_PREGAO', '10:00'), '%H:%M').time()
+FIM_PREGAO = datetime.strptime(os.getenv('FIM_PREGAO', '17:00'), '%H:%M').time()
+
 
 async def main(periodicidade: int) -> None:
     """
@@ -30,4 +44,72 @@ async def main(periodicidade: int) -> None:
         await asyncio.sleep(periodicidade * 3600)
 
 
-asyncio.run(main(24))
\ No newline at end of file
+def _em_pregao(agora: datetime) -> bool:
+    """Retorna True se `agora` (no horário de Brasília) está em um dia útil, dentro do horário do pregão."""
+    return agora.weekday() < 5 and INICIO_PREGAO <= agora.time() <= FIM_PREGAO
+
+
+async def main_intraday(intervalo_minutos: int) -> None:
+    """
+    Captura snapshots intraday durante o pregão, com gravação em micro-lotes.
+
+    A cada intervalo, se o pregão estiver aberto (no horário de Brasília), os
+    dados são coletados com `scrap.coletar()` e acrescentados, com o horário de
+    início da coleta, a um `intraday.BufferIntraday`, que grava arquivos Parquet
+    no S3 por tamanho ou por tempo. Fora do horário do pregão, o buffer é
+    descarregado.
+
+    O intervalo é contado a partir do início de cada captura, e não do seu fim,
+    para que as capturas não se desloquem ao longo do dia. Capturas que excedem
+    o intervalo são registradas no console.
+
+    Parâmetros:
+    -----------
+    intervalo_minutos : int
+        O intervalo de tempo (em minutos) entre cada captura.
+
+    Exemplo de uso:
+    ---------------
+    Para capturar um snapshot por minuto:
+
+        asyncio.run(main_intraday(1))
+
+    Tratamento de Erros:
+    --------------------
+    - Se uma captura falhar, o erro é exibido no console e a captura é ignorada;
+      a coleta continua no próximo intervalo.
+
+    Observação:
+    ------------
+    O buffer é sempre descarregado ao encerrar, inclusive por Ctrl+C ou SIGTERM.
+    """
+    intervalo = intervalo_minutos * 60
+    buffer = intraday.BufferIntraday()
+    try:
+        while True:
+            inicio = time.monotonic()
+            agora = datetime.now(intraday.FUSO_HORARIO)
+            if _em_pregao(agora):
+                try:
+                    buffer.adicionar(scrap.coletar(), captura=agora)
+                except Exception as e:
+                    print(f'Erro na captura intraday, captura ignorada: {e}')
+                buffer.flush_se_expirado()
+            else:
+                buffer.flush()
+
+            duracao = time.monotonic() - inicio
+            if duracao > intervalo:
+                print(f'Captura intraday levou {duracao:.1f} s, acima do intervalo de {intervalo} s.')
+            await asyncio.sleep(max(0, intervalo - duracao))
+    finally:
+        buffer.flush()
+
+
+# Converte o SIGTERM em SystemExit para que o buffer intraday seja descarregado
+signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+if MODO_EXECUCAO == 'intraday':
+    asyncio.run(main_intraday(INTERVALO_INTRADAY_MINUTOS))
+else:
+    asyncio.run(main(24))
@@ -9,7 +9,7 @@ def upload(
         bucket_path: str,
         object_name: str = None,
         prefix: str = None
-) -> None:
+) -> bool:
     """
     Faz o upload de um arquivo local para um bucket no Amazon S3.
 
@@ -29,6 +29,11 @@ def upload(
         Prefixo opcional para organizar o arquivo dentro de uma pasta virtual
         no bucket.
 
+    Retorno:
+    --------
+    bool
+        True se o upload foi concluído com sucesso, False caso contrário.
+
     Comportamento:
     --------------
     - Se `object_name` não for informado, o nome do arquivo será extraído a partir de `your_file_path`.
@@ -38,7 +43,7 @@ def upload(
     Tratamento de Erros:
     --------------------
     - Caso ocorra um erro durante o upload, uma mensagem de erro será exibida
-      no console e a exceção será capturada.
+      no console, a exceção será capturada e a função retornará False.
 
     Exemplo de uso:
     ---------------
@@ -59,6 +64,8 @@ def upload(
 
         s3_client.upload_file(your_file_path, bucket_path, object_name)       
         print('\n\033[32mDados enviados para o S3 com sucesso!\033[0m')
+        return True
     
     except Exception as e:
         print(e)
+        return False
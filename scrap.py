@@ -17,11 +17,100 @@ import os
 BUCKET_NAME = 'valteci-b3-raw'
 URL = "https://sistemaswebb3-listados.b3.com.br/indexPage/day/IBOV?language=pt-br"
 
+# Perfil do navegador: 'completo' (padrão, opções originais) ou 'leve'
+PERFIS_NAVEGADOR = {'completo', 'leve'}
+PERFIL_NAVEGADOR = os.getenv('PERFIL_NAVEGADOR', 'completo')
+LIMITE_MEMORIA_NAVEGADOR_MB = int(os.getenv('LIMITE_MEMORIA_NAVEGADOR_MB', '256'))
+_RECURSOS_BLOQUEADOS_PADRAO = (
+    '*.png,*.jpg,*.jpeg,*.gif,*.svg,*.webp,*.ico,'
+    '*.woff,*.woff2,*.ttf,*.otf,*.eot,*.css,'
+    '*google-analytics.com*,*googletagmanager.com*,*doubleclick.net*,'
+    '*hotjar.com*,*facebook.net*,*clarity.ms*'
+)
+RECURSOS_BLOQUEADOS = [
+    padrao.strip()
+    for padrao in os.getenv('RECURSOS_BLOQUEADOS', _RECURSOS_BLOQUEADOS_PADRAO).split(',')
+    if padrao.strip()
+]
+
 def _data_de_hoje() -> str:
     """Retorna a data de hoje no formato dd-mm-YYYY"""
     return datetime.strftime(datetime.now(), '%d-%m-%Y')
 
 
+def _criar_driver(perfil: str = PERFIL_NAVEGADOR) -> webdriver.Chrome:
+    """
+    Cria uma instância do Chrome headless de acordo com o perfil informado.
+
+    Parâmetros:
+    -----------
+    perfil : str, opcional
+        Perfil do navegador. Por padrão utiliza a variável de ambiente
+        `PERFIL_NAVEGADOR` (ou 'completo', caso não esteja definida).
+        - 'completo': apenas `--headless`, `--disable-gpu` e `--no-sandbox`.
+        - 'leve': além das opções acima, bloqueia os recursos listados em
+          `RECURSOS_BLOQUEADOS` (por padrão imagens, fontes, CSS e analytics),
+          usa a estratégia de carregamento `eager`, desativa extensões e tráfego
+          em segundo plano e limita a memória do renderer.
+
+    Retorno:
+    --------
+    webdriver.Chrome
+        O driver configurado e pronto para uso.
+
+    Tratamento de Erros:
+    --------------------
+    - Um perfil diferente de 'leve' ou 'completo' gera `ValueError`.
+    - Se o bloqueio de recursos falhar, o driver é encerrado e a exceção é relançada.
+
+    Observação:
+    ------------
+    - O limite de memória (heap JavaScript) é definido pela variável de ambiente
+      `LIMITE_MEMORIA_NAVEGADOR_MB`.
+    - Os padrões de URL bloqueados podem ser sobrescritos pela variável de ambiente
+      `RECURSOS_BLOQUEADOS` (lista separada por vírgulas).
+
+    Exemplo de uso:
+    ---------------
+    driver = _criar_driver('leve')
+    driver.get(URL)
+    """
+    if perfil not in PERFIS_NAVEGADOR:
+        raise ValueError(f"Perfil de navegador inválido: '{perfil}'. Use 'leve' ou 'completo'.")
+
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+
+    if perfil == 'leve':
+        # Retorna do `get` no DOMContentLoaded; as tabelas são aguardadas com WebDriverWait
+        options.page_load_strategy = 'eager'
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-component-update')
+        options.add_argument('--disable-default-apps')
+        options.add_argument('--disable-sync')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--no-first-run')
+        options.add_argument('--mute-audio')
+        options.add_argument('--renderer-process-limit=1')
+        options.add_argument(f'--js-flags=--max-old-space-size={LIMITE_MEMORIA_NAVEGADOR_MB}')
+
+    service = Service(ChromeDriverManager().install())
+    driver = webdriver.Chrome(service=service, options=options)
+
+    if perfil == 'leve' and RECURSOS_BLOQUEADOS:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': RECURSOS_BLOQUEADOS})
+        except Exception:
+            driver.quit()
+            raise
+
+    return driver
+
+
 def _to_dataframe_codigo(tabela)-> pd.DataFrame:
     """
     Converte uma tabela HTML contendo dados por código em um DataFrame formatado.
@@ -146,7 +235,7 @@ def _to_dataframe_setor(tabela)-> pd.DataFrame:
     return df_final
 
 
-def _scraping_por_codigo() -> pd.DataFrame:
+def _scraping_por_codigo(driver: webdriver.Chrome = None) -> pd.DataFrame:
     """
     Realiza o scraping de dados por na tabela por código e retorna um DataFrame com as informações
     coletadas.
@@ -157,7 +246,9 @@ def _scraping_por_codigo() -> pd.DataFrame:
 
     Parâmetros:
     -----------
-    Nenhum.
+    driver : webdriver.Chrome, opcional
+        Driver a ser utilizado. Se não for informado, é criado com `_criar_driver`.
+        Em ambos os casos, o driver é encerrado pela função.
 
     Retorno:
     --------
@@ -172,7 +263,7 @@ def _scraping_por_codigo() -> pd.DataFrame:
 
     Fluxo do Processo:
     ------------------
-    1. Configura o Selenium com o ChromeDriver no modo headless.
+    1. Configura o Selenium com o ChromeDriver no modo headless, usando o perfil definido em `_criar_driver`.
     2. Acessa a URL especificada.
     3. Inicializa um DataFrame vazio com as colunas especificadas.
     4. Itera pelas páginas (1 a 5), clicando em cada botão de paginação quando necessário.
@@ -184,8 +275,8 @@ def _scraping_por_codigo() -> pd.DataFrame:
     --------------------
     - Se houver erro ao clicar na paginação ou carregar a tabela, uma mensagem é exibida,
       e a execução continua na próxima página.
-    - Caso ocorra uma falha grave ao carregar a página ou a tabela, o driver é encerrado 
-      e o programa é finalizado com `exit(1)`.
+    - Caso ocorra uma falha grave ao carregar a página ou a tabela, uma exceção
+      `RuntimeError` é lançada. O driver é sempre encerrado ao final, com ou sem erro.
 
     Exemplo de uso:
     ---------------
@@ -193,17 +284,12 @@ def _scraping_por_codigo() -> pd.DataFrame:
     print(df_codigo.head())
     """
     print('\n\n===========Iniciando scraping por código===========\n\n')
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
-
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-
-    driver.get(URL)
+    if driver is None:
+        driver = _criar_driver()
 
     try:
+        driver.get(URL)
+
         df_final = pd.DataFrame({
         'Código': pd.Series(dtype='str'),              # Tipo string
         'Ação': pd.Series(dtype='str'),                # Tipo string
@@ -241,11 +327,13 @@ def _scraping_por_codigo() -> pd.DataFrame:
     except Exception as e:
         print(e)
         print("Erro ao carregar a tabela por código.")
+        raise RuntimeError("Erro ao carregar a tabela por código.") from e
+
+    finally:
         driver.quit()
-        exit(1)
 
 
-def _scraping_por_setor() -> pd.DataFrame:
+def _scraping_por_setor(driver: webdriver.Chrome = None) -> pd.DataFrame:
     """
     Realiza o scraping de dados na tabela por setor e retorna um DataFrame com as informações
     coletadas.
@@ -256,7 +344,9 @@ def _scraping_por_setor() -> pd.DataFrame:
 
     Parâmetros:
     -----------
-    Nenhum.
+    driver : webdriver.Chrome, opcional
+        Driver a ser utilizado. Se não for informado, é criado com `_criar_driver`.
+        Em ambos os casos, o driver é encerrado pela função.
 
     Retorno:
     --------
@@ -269,7 +359,7 @@ def _scraping_por_setor() -> pd.DataFrame:
 
     Fluxo do Processo:
     ------------------
-    1. Configura o Selenium com o ChromeDriver no modo headless.
+    1. Configura o Selenium com o ChromeDriver no modo headless, usando o perfil definido em `_criar_driver`.
     2. Acessa a URL especificada.
     3. Seleciona uma opção específica no elemento `<select>` com ID `'segment'`.
     4. Itera pelas páginas (1 a 5), clicando em cada botão de paginação quando necessário.
@@ -280,8 +370,8 @@ def _scraping_por_setor() -> pd.DataFrame:
     --------------------
     - Se houver erro ao clicar na paginação ou carregar a tabela, uma mensagem será exibida,
       e a função continua a execução na próxima página.
-    - Caso ocorra uma falha grave ao carregar a página ou a tabela, o driver é encerrado
-      e o programa é finalizado com `exit(1)`.
+    - Caso ocorra uma falha grave ao carregar a página ou a tabela, uma exceção
+      `RuntimeError` é lançada. O driver é sempre encerrado ao final, com ou sem erro.
 
     Exemplo de uso:
     ---------------
@@ -289,14 +379,10 @@ def _scraping_por_setor() -> pd.DataFrame:
     print(df_setor.head())
     """
     print('\n\n===========Iniciando scraping por setor===========\n\n')
-    try:
-        options = Options()
-        options.add_argument('--headless')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--no-sandbox')
+    if driver is None:
+        driver = _criar_driver()
 
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
+    try:
         driver.get(URL)
 
         select_element = WebDriverWait(driver, 10).until(
@@ -341,13 +427,16 @@ def _scraping_por_setor() -> pd.DataFrame:
 
         except Exception as e:
             print("erro: ", e)
+            raise
 
 
     except Exception as err:
         print(err)
         print("Erro ao carregar a tabela por setor")
+        raise RuntimeError("Erro ao carregar a tabela por setor.") from err
+
+    finally:
         driver.quit()
-        exit(1)
 
 
 def _send_to_s3(filename: str, bucket_name: str) -> None:
@@ -391,7 +480,7 @@ def _remove_file(file_path: str) -> None:
             os.remove(file_path)
 
 
-def _gerar_parquet(df: pd.DataFrame, filename: str) -> None:
+def _gerar_parquet(df: pd.DataFrame, filename: str) -> bool:
     """
     Gera um arquivo Parquet a partir de um DataFrame.
 
@@ -405,6 +494,11 @@ def _gerar_parquet(df: pd.DataFrame, filename: str) -> None:
     filename : str
         O nome do arquivo de saída, incluindo a extensão `.parquet`.
 
+    Retorno:
+    --------
+    bool
+        True se o arquivo foi gerado com sucesso, False caso contrário.
+
     Tratamento de Erros:
     --------------------
     Caso ocorra algum erro durante a geração do arquivo, uma mensagem
@@ -416,26 +510,43 @@ def _gerar_parquet(df: pd.DataFrame, filename: str) -> None:
             engine='fastparquet',
             index=False
         )
+        return True
 
     except Exception as e:
         print('Erro ao gerar parquet:', e)
+        return False
 
 
-def start():
+def coletar() -> pd.DataFrame:
     """
-    Executa o processo completo de scraping, tratamento e envio de dados para o S3.
+    Coleta os dados por código e por setor e retorna o DataFrame combinado.
 
     Essa função realiza as seguintes etapas:
     1. Coleta dados por código usando a função `_scraping_por_codigo`.
     2. Coleta dados por setor usando a função `_scraping_por_setor`.
     3. Faz a junção (merge) dos dois DataFrames com base na coluna 'Código'.
-    4. Gera um arquivo `.parquet` com os dados processados, nomeado com a data atual.
-    5. Envia o arquivo gerado para um bucket S3 especificado.
-    6. Remove o arquivo gerado localmente após o envio bem-sucedido.
+
+    Retorno:
+    --------
+    pd.DataFrame
+        O DataFrame com os dados do pregão, uma linha por ativo.
     """
     df_codigo = _scraping_por_codigo()
     df_setor = _scraping_por_setor()
-    df_final = pd.merge(df_codigo, df_setor, on='Código', how='inner')
+    return pd.merge(df_codigo, df_setor, on='Código', how='inner')
+
+
+def start():
+    """
+    Executa o processo completo de scraping, tratamento e envio de dados para o S3.
+
+    Essa função realiza as seguintes etapas:
+    1. Coleta os dados por código e por setor usando a função `coletar`.
+    2. Gera um arquivo `.parquet` com os dados processados, nomeado com a data atual.
+    3. Envia o arquivo gerado para um bucket S3 especificado.
+    4. Remove o arquivo gerado localmente após o envio bem-sucedido.
+    """
+    df_final = coletar()
     filename = f'{_data_de_hoje()}.parquet'
     _gerar_parquet(df_final, filename)
     _send_to_s3(filename, BUCKET_NAME)
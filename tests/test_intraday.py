@@ -0,0 +1,79 @@
+import importlib
+import os
+import sys
+import types
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def intraday(monkeypatch, tmp_path):
+    """Importa `intraday` com `s3` e `scrap` substituídos por stubs, no diretório temporário."""
+    enviados = []
+    falhar = {'ativo': False}
+
+    def upload(filename, bucket_name, object_name=None, prefix=None):
+        if falhar['ativo']:
+            return False
+        enviados.append(f'{prefix}/{filename}')
+        return True
+
+    def gerar_parquet(df, filename):
+        df.to_csv(filename, index=False)
+        return True
+
+    def remove_file(file_path):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+    monkeypatch.setitem(sys.modules, 's3', types.SimpleNamespace(upload=upload))
+    monkeypatch.setitem(sys.modules, 'scrap', types.SimpleNamespace(
+        _gerar_parquet=gerar_parquet,
+        _remove_file=remove_file,
+    ))
+    monkeypatch.delitem(sys.modules, 'intraday', raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    modulo = importlib.import_module('intraday')
+    modulo.enviados = enviados
+    modulo.falhar = falhar
+    return modulo
+
+
+def _captura(hora, minuto, segundo, intraday):
+    return datetime(2025, 3, 17, hora, minuto, segundo, tzinfo=intraday.FUSO_HORARIO)
+
+
+def test_flush_com_falha_mantem_buffer_e_nao_deixa_arquivos(intraday, tmp_path):
+    df = pd.DataFrame({'Código': ['PETR4', 'VALE3'], 'Qtde. Teórica': [1, 2]})
+    buffer = intraday.BufferIntraday(max_linhas=1000, max_segundos=900, limite_memoria_mb=1)
+
+    intraday.falhar['ativo'] = True
+    buffer.adicionar(df, captura=_captura(10, 0, 5, intraday))
+    assert buffer.flush() is False
+
+    buffer.adicionar(df, captura=_captura(10, 1, 5, intraday))
+    assert buffer.flush() is False
+    assert os.listdir(tmp_path) == []
+
+    intraday.falhar['ativo'] = False
+    assert buffer.flush() is True
+
+    assert intraday.enviados == ['dia=17-03-2025/hora=10/17-03-2025_10-00-05_10-01-05.parquet']
+    assert os.listdir(tmp_path) == []
+    assert buffer._capturas == []
+    assert buffer._inicio_lote is None
+
+
+def test_particoes_usam_horario_de_brasilia(intraday):
+    df = pd.DataFrame({'Código': ['PETR4'], 'Qtde. Teórica': [1]})
+    buffer = intraday.BufferIntraday()
+
+    # 13:30 UTC corresponde a 10:30 no horário de Brasília
+    captura = datetime.fromisoformat('2025-03-17T13:30:00+00:00')
+    buffer.adicionar(df, captura=captura)
+    buffer.flush()
+
+    assert intraday.enviados == ['dia=17-03-2025/hora=10/17-03-2025_10-30-00_10-30-00.parquet']